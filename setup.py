@@ -29,10 +29,11 @@ setuptools.setup(
     ],
     package_dir={"": "src"},
     packages=setuptools.find_packages(where="src"),
-    python_requires=">=3.7",
-    install_requires=['pysam==0.19.1', 'six==1.16.0'],
+    python_requires=">=3.10",
+    install_requires=['numpy>=1.20', 'pysam==0.19.1', 'six==1.16.0'],
     extras_require={
-        'dev': ['build==0.9.0', 'twine==4.0.1']
+        'dev': ['build==0.9.0', 'twine==4.0.1'],
+        'perf': ['pandas', 'numba']
     },
     entry_points={'console_scripts': {
         'selectFWPeaks=scripts.selectFWPeaks:main'}
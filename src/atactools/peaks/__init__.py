@@ -5,5 +5,7 @@
 
 # module imports
 from .intervals import Interval, Bed6, NarrowPeak
+from .io import read_peaks, write_peaks
 from .normalize import normalize_peaks
-from .normalize import STRATEGIES
\ No newline at end of file
+from .normalize import STRATEGIES
+from .select import select_fw_peaks
\ No newline at end of file
@@ -7,22 +7,34 @@
 
 # module imports
 # ----------------------------------------------------------------------------
-from dataclasses import dataclass
-from operator import lt, gt, eq
-from re import split as re_split
+from dataclasses import dataclass, field
+from functools import lru_cache, total_ordering
+from re import compile as re_compile
+from sys import intern
 from typing import Union
 
 
+# module constants
+# ----------------------------------------------------------------------------
+# precompiled pattern splitting contig names into string and digit runs,
+# compiled once at import rather than on every comparison
+_CHROM_RE = re_compile('([0-9]+)')
+
+
 # function definitions
 # ----------------------------------------------------------------------------
 # function prep_chrom_compare() splits contig names that are a combo of
-# strings and digits to use as sorting keys in sort functions and similar 
-# processes. for example: 'chr1' -> ('chr', 1). this function can be 
-# used in the sorted() function with the key=prep_chrom_comp argument
+# strings and digits to use as sorting keys in sort functions and similar
+# processes. for example: 'chr1' -> ('chr', 1). this function can be
+# used in the sorted() function with the key=prep_chrom_comp argument.
+# results are memoized since peak sets contain millions of intervals but
+# only a handful of distinct contig names; the key is returned as a
+# tuple so cached values are hashable and immutable
+@lru_cache(maxsize=1024)
 def prep_chrom_comp(chrom: str):
     def recode(substr: str):
         return int(substr) if substr.isdigit() else substr.lower()
-    return [recode(sub) for sub in re_split('([0-9]+)',chrom)]
+    return tuple(recode(sub) for sub in _CHROM_RE.split(chrom))
 
 
 # class definitions
@@ -40,17 +52,29 @@ def prep_chrom_comp(chrom: str):
 #     2. chromosome start position (chromEnd) -required-
 #     3. chromosome end position (chromEnd) -required- 
 #     4. feature name (name) -required-
-@dataclass
+@dataclass(slots=True, eq=False)
+@total_ordering
 class Interval():
     chrom: str
     chromStart: int
     chromEnd: int
     name: str
+    norm_score: float = field(default=-1, init=False)
+    _chrom_key: tuple = field(default=(), init=False, repr=False)
 
-    # add a default field not specified in the user-specified
-    # arguments for the normalized_score field
+    # cast the coordinate fields to int at construction so downstream
+    # comparisons and arithmetic never fall back to string semantics,
+    # and precompute the natural-sort chromosome key once per interval
+    # so comparisons avoid re-splitting the contig name. the contig name
+    # is interned so the few distinct names are stored once and chrom
+    # equality checks short-circuit on identity. the name field is left
+    # alone since it is unique per record and would only grow the
+    # interned-string table
     def __post_init__(self):
-        self.norm_score = -1
+        self.chrom = intern(self.chrom)
+        self.chromStart = int(self.chromStart)
+        self.chromEnd = int(self.chromEnd)
+        self._chrom_key = prep_chrom_comp(self.chrom)
 
     # define a custom printout representation for the Interval
     def __repr__(self):
@@ -66,43 +90,21 @@ class Interval():
         return comp
     
     # define a custom function for the less than (<) comparator
-    # based on interval algebra on matching chromosomes
+    # based on the precomputed natural-sort chromosome key, then the
+    # interval coordinates. the remaining rich comparators (>, <=, >=)
+    # are derived from __lt__ and __eq__ by functools.total_ordering
     def __lt__(self, other):
-        if lt(*[prep_chrom_comp(c) for c in [self.chrom, other.chrom]]): return True
-        elif gt(*[prep_chrom_comp(c) for c in [self.chrom, other.chrom]]): return False
-        else: # if the chromosomes names are equal by natural sort
-            comp = ((self.chromEnd < other.chromStart) or
-                    ((self.chromStart == other.chromStart) and
-                    (self.chromEnd < other.chromEnd)))
-            return comp
-    
-    # define a custom function for the greater than (>) comparator
-    # based on interval algebra on matching chromosomes
-    def __gt__(self, other):
-        if lt(*[prep_chrom_comp(c) for c in [self.chrom, other.chrom]]): return False
-        elif gt(*[prep_chrom_comp(c) for c in [self.chrom, other.chrom]]): return True
-        else: # if the chromosomes names are equal by natural sort
-            comp = (self.chromStart > other.chromStart)
-            return comp
-    
-    # define a custom function for the less than or equal to (<=) comparator
-    # based on niterval algebra on matching chromosomes
-    def __le__(self,other):
-        return (self.__lt__(other) or self.__eq__(other))
-    
-    # define a custom function for the greater than or equal to (>=) comparator
-    # based on interval algebra on matching chromosomes
-    def __ge__(self,other):
-        return (self.__gt__(other) or self.__eq__(other))
+        return ((self._chrom_key, self.chromStart, self.chromEnd) <
+                (other._chrom_key, other.chromStart, other.chromEnd))
     
     # define a custom function to determine whether the interval intersects
-    # another interval. intervals on separate chromosomes do not intersect
+    # another interval. intervals on separate chromosomes do not intersect,
+    # and the test is half-open per the BED convention, so intervals that
+    # merely touch ([0,10) and [10,20)) do not intersect
     def intersect(self,other):
-        if self.chrom != other.chrom: return True
-        else:
-            return not (  # define intersection conditions
-                (other.chromEnd < self.chromStart) or 
-                (other.chromStart > self.chromEnd)) 
+        return ((self.chrom == other.chrom) and
+                (other.chromStart < self.chromEnd) and
+                (self.chromStart < other.chromEnd))
 
 
 # class Bed6() - child class of Interval() which adds score and strand.
@@ -112,11 +114,20 @@ class Interval():
 # * the class adds two attributes to the Interval base class:
 #    1. interval score (score); typically 1-1000 -required, missing denoted by '.'-
 #    2. feature strandness (strand) -required, missingness denoted by '.'-
-@dataclass
+@dataclass(slots=True, eq=False)
 class Bed6(Interval):
-    score: Union[int,str]
+    score: Union[float,str]
     strand: str
 
+    # cast the score field to float at construction, leaving the
+    # BED missing-value marker '.' untouched. note: the explicit base
+    # class call is required because slots=True rebuilds the class and
+    # breaks zero-argument super() in dataclass methods
+    def __post_init__(self):
+        Interval.__post_init__(self)
+        if self.score != '.': self.score = float(self.score)
+        self.strand = intern(self.strand)
+
     # define a custom printout representation for the Bed6
     def __repr__(self):
         spec_int = f" {self.chrom} {self.chromStart} {self.chromEnd} {self.name}"
@@ -134,13 +145,22 @@ class Bed6(Interval):
 #    2. -log10 of p-value of the peak enrichment (log_pval) -required-
 #    3. -log10 of FDR adjusted q-value (log_qval) -required-
 #    4. basepair offset from chromStart for peak summit (summit) -required-
-@dataclass
+@dataclass(slots=True, eq=False)
 class NarrowPeak(Bed6):
     sigval: float
     log_pval: float
     log_qval: float
     summit: int
-    
+
+    # cast the enrichment statistics to float and the summit offset
+    # to int at construction
+    def __post_init__(self):
+        Bed6.__post_init__(self)
+        self.sigval = float(self.sigval)
+        self.log_pval = float(self.log_pval)
+        self.log_qval = float(self.log_qval)
+        self.summit = int(self.summit)
+
     # define a custom printout representation for the Bed6
     def __repr__(self):
         spec_int = f" {self.chrom} {self.chromStart} {self.chromEnd} {self.name}"
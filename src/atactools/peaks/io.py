@@ -0,0 +1,61 @@
+# File Name: io.py
+# Created By: ZW
+# Created On: 2022-11-08
+# Purpose: defines functions for reading peak files (.bed, .narrowPeak)
+#  into peak objects. parsing goes through pandas.read_csv when pandas is
+#  installed so line tokenization runs in C instead of a per-line python
+#  split, with a plain-python reader as the fallback.
+
+
+# module imports
+# ----------------------------------------------------------------------------
+from mmap import ACCESS_READ, mmap
+from os import fstat
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; fall back to the plain reader
+    pd = None
+
+
+# function definitions
+# ----------------------------------------------------------------------------
+
+# function read_peaks() reads a whitespace-delimited peaks file and returns
+# a list of peaks_type objects (e.g. Bed6 or NarrowPeak), one per record.
+# fields are passed to the constructor as strings; the peak classes cast
+# coordinates and scores to their numeric types at construction
+def read_peaks(filepath, peaks_type):
+    if pd is not None:
+        try:
+            # sep=r'\s+' splits on any whitespace run like the fallback
+            # reader's .split(), and is special-cased by read_csv to stay
+            # on the C parsing engine. na_filter=False keeps NA-like
+            # tokens ('NA', 'NaN', ...) as their literal text — and skips
+            # the NA scan — so fields round-trip exactly like the fallback
+            frame = pd.read_csv(filepath, sep=r'\s+', header=None,
+                                dtype=str, na_filter=False)
+        except pd.errors.EmptyDataError:
+            return [] # a sample with zero called peaks is valid input
+        return [peaks_type(*row)
+                for row in frame.itertuples(index=False, name=None)]
+    # fallback reader: memory-map the file and tokenize it in bulk — the
+    # whole buffer is decoded once and the line/field splits run in C,
+    # instead of a python-level strip/split round trip per buffered line
+    with open(filepath, 'rb') as input_obj:
+        if fstat(input_obj.fileno()).st_size == 0: return []
+        with mmap(input_obj.fileno(), 0, access=ACCESS_READ) as mapped:
+            text = mapped[:].decode()
+    return [peaks_type(*fields.split())
+            for fields in text.splitlines() if fields]
+
+
+# function write_peaks() writes peaks to a BED6-style file with the
+# normalized score in the score column. the records are joined into a
+# single string and written with one call rather than a buffered write
+# per peak, which keeps the output path out of the python write loop
+def write_peaks(filepath, peaks_list):
+    with open(filepath, 'w') as fobj:
+        fobj.write("".join(
+            f"{p.chrom}\t{p.chromStart}\t{p.chromEnd}"
+            f"\t{p.name}\t{p.norm_score}\t{p.strand}\n"
+            for p in peaks_list))
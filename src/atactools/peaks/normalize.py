@@ -6,10 +6,11 @@
 
 # module imports
 # ----------------------------------------------------------------------------
-from math import sqrt
 from operator import attrgetter
-from random import gauss, seed
-from statistics import fmean, median
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the pure-python path
+    np = None
 
 
 # module constants 
@@ -19,31 +20,36 @@ STRATEGIES = ["map", "none"]
 # function definitions
 # ----------------------------------------------------------------------------
 
+# function score_value() maps a raw score to the float used for ranking and
+# selection. the peak classes preserve the BED missing-value marker '.' at
+# construction, so it can show up anywhere a score does; it is treated as
+# the lowest possible score, ranking missing-score records below all others
+def score_value(score):
+    return float('-inf') if score == '.' else score
+
+
 # function extract_scores() which returns a list of scores given a list of
 # objects with variable attribute representing the score field which can be any
 # string, so long as it matches an underlying attribute name
 def extract_scores(objs, field_name="score"):
-    score_getter = attrgetter(field_name)
-    return [score_getter(obj) for obj in objs]
+    return [getattr(obj, field_name) for obj in objs]
 
 
 # function set_scores() which applies a set of scores to a set of objects
 # of the same length. This function can be used to apply normalized scores 
 # back to objects after they were extracted and processed. 
 def set_scores(objs, scores, field_name="score"):
-    def score_setter(obj, value): obj.__dict__[field_name] = value 
-    [score_setter(obj, score) for obj, score in zip(objs, scores)]
+    for obj, score in zip(objs, scores):
+        setattr(obj, field_name, score)
 
 
 # generator object pointmap() acts similarly to numpy linspace. its only argument
 # is the number of points to return, it will return that number of equidistant 
 # floats on the interval (0,1)
-def regular_pointmap(n, start=0.0, end=1.0, rounderr=5):
+def regular_pointmap(n, start=0.0, end=1.0):
     dist = end / (n + 1)
-    last = start
-    while last + dist < end:
-        yield round(last + dist, rounderr)
-        last += dist
+    for k in range(1, n + 1):
+        yield start + k * dist
 
 
 # function normalize_peaks_map() normalizes the peaks through a process of 
@@ -51,15 +57,38 @@ def regular_pointmap(n, start=0.0, end=1.0, rounderr=5):
 # (0,1). This method makes peaksets with different dynamic score ranges more
 # comprable by using a rank-based approximate normalization.
 def normalize_peaks_map(objs, field_name="score"):
-    objs.sort(key=attrgetter(field_name)) # sort the objects by score -low to high
-    set_scores(objs, scores=list(regular_pointmap(len(objs))), field_name="norm_score")
-    objs.sort() # return to chromosome/positional ordering
+    n = len(objs)
+    if np is not None and n > 0:
+        # rank the scores with a stable argsort on a float array rather
+        # than sorting the objects themselves, then scatter the uniform
+        # pointmap values back into input order before assignment
+        scores = np.asarray([score_value(s) for s in
+                             extract_scores(objs, field_name)],
+                            dtype=np.float64)
+        order = np.argsort(scores, kind='stable')
+        pointmap = np.arange(1, n + 1) / (n + 1)
+        norm_scores = np.empty(n, dtype=np.float64)
+        norm_scores[order] = pointmap
+        set_scores(objs, scores=norm_scores.tolist(), field_name="norm_score")
+    else:
+        # rank through a sorted index list so the objects themselves are
+        # never rearranged by score; the pointmap value for each rank is
+        # scattered back to the peak at that index
+        score_getter = attrgetter(field_name)
+        order = sorted(range(n), key=lambda i: score_value(score_getter(objs[i])))
+        norm_scores = [0.0] * n
+        for value, idx in zip(regular_pointmap(n), order):
+            norm_scores[idx] = value
+        set_scores(objs, scores=norm_scores, field_name="norm_score")
+    objs.sort() # sort into chromosome/positional ordering
     return objs
 
 # define a function normalize_peaks_none() which does not normalize scores but acts
-# as a placeholder identity function for the subsequent normalize_peaks function
+# as a placeholder identity function for the subsequent normalize_peaks function.
+# raw scores pass through score_value so norm_score is always numeric ('.'
+# becomes -inf) by the time the selection sweep compares it
 def normalize_peaks_none(objs, field_name):
-    scores = extract_scores(objs, field_name)
+    scores = [score_value(s) for s in extract_scores(objs, field_name)]
     set_scores(objs, scores=scores, field_name="norm_score")
     objs.sort()
     return objs
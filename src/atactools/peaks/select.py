@@ -0,0 +1,143 @@
+# File Name: select.py
+# Created By: ZW
+# Created On: 2022-11-07
+# Purpose: defines functions for selecting the most representative set of
+#  non-overlapping peaks from a sorted, normalized peak set. the selection
+#  sweep operates on structure-of-arrays views of the peak coordinates so
+#  the clustering and score-argmax passes run as vectorized numpy loops
+#  instead of per-object python comparisons.
+
+
+# module imports
+# ----------------------------------------------------------------------------
+from .normalize import score_value
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the pure-python sweep
+    np = None
+try:
+    from numba import njit
+except ImportError:  # numba is an optional accelerator for the sweep kernel
+    njit = None
+
+
+# function definitions
+# ----------------------------------------------------------------------------
+
+# function select_fw_peaks() takes a list of peak objects which have been
+# normalized (carrying a norm_score attribute) and sorted by chromosome and
+# position, and returns the best-scoring peak from each cluster of mutually
+# overlapping peaks. clusters are detected with a running-maximum sweep over
+# the interval ends, restarted at each chromosome boundary.
+# * note on interval indexes: because the input is fully sorted and every
+#   peak is consumed exactly once, the linear sweep already yields the same
+#   flattened overlap clusters an interval tree or nested-containment list
+#   would — building such an index would add O(n log n) construction work
+#   and per-peak queries without changing the result, so no index is used.
+def select_fw_peaks(normalized_peaks):
+    n = len(normalized_peaks)
+    if n == 0: return []
+    if np is None: return _select_fw_peaks_python(normalized_peaks)
+
+    # unpack the peak objects into structure-of-arrays form. chromosome
+    # names are encoded as compact int16 category codes (assemblies hold
+    # at most a few thousand contigs); the input is already sorted so each
+    # chromosome occupies a contiguous block and only code changes (not
+    # code order) matter for boundary detection
+    chroms = np.array([p.chrom for p in normalized_peaks])
+    starts = np.fromiter((p.chromStart for p in normalized_peaks),
+                         dtype=np.int64, count=n)
+    ends = np.fromiter((p.chromEnd for p in normalized_peaks),
+                       dtype=np.int64, count=n)
+    scores = np.fromiter((score_value(p.norm_score) for p in normalized_peaks),
+                         dtype=np.float64, count=n)
+    chrom_codes = np.unique(chroms, return_inverse=True)[1].astype(np.int16)
+
+    # with numba installed, run the fused single-pass kernel over the
+    # arrays: clustering, running-end tracking and per-cluster argmax all
+    # happen in one compiled loop instead of several vectorized passes
+    if njit is not None:
+        selected = _sweep_kernel(chrom_codes, starts, ends, scores)
+        return [normalized_peaks[i] for i in selected]
+
+    # mark the start of each overlap cluster. a new cluster begins at each
+    # chromosome change, and wherever a peak starts at or beyond the running
+    # maximum end of the peaks before it on the same chromosome (intervals
+    # are half-open, so a peak starting exactly at the running end does not
+    # overlap it)
+    breaks = np.zeros(n, dtype=bool)
+    breaks[0] = True
+    breaks[1:] |= (chrom_codes[1:] != chrom_codes[:-1])
+    chrom_bounds = np.flatnonzero(breaks).tolist() + [n]
+    for lo, hi in zip(chrom_bounds[:-1], chrom_bounds[1:]):
+        running_end = np.maximum.accumulate(ends[lo:hi])
+        breaks[lo+1:hi] |= (starts[lo+1:hi] >= running_end[:-1])
+    cluster_ids = np.cumsum(breaks) - 1
+
+    # pick the index of the best-scoring peak in each cluster. a stable
+    # lexsort on (cluster, -score) places the first occurrence of each
+    # cluster's maximum score at the head of its group
+    order = np.lexsort((-scores, cluster_ids))
+    group_starts = np.ones(order.shape[0], dtype=bool)
+    group_starts[1:] = (cluster_ids[order][1:] != cluster_ids[order][:-1])
+    selected = np.sort(order[group_starts])
+    return [normalized_peaks[i] for i in selected]
+
+
+# function _sweep_kernel() is the fused jit-compiled selection sweep: a
+# single loop over the structure-of-arrays data that tracks the running
+# cluster end and the index of the best score seen in the current cluster,
+# emitting that index whenever a new cluster opens. cluster boundaries
+# match the vectorized passes exactly (chromosome change, or a half-open
+# start at/beyond the running end; first maximum wins on score ties)
+if njit is not None:
+    @njit(cache=True)
+    def _sweep_kernel(chrom_codes, starts, ends, scores):
+        n = starts.shape[0]
+        selected = np.empty(n, dtype=np.int64)
+        n_selected = 0
+        best = 0
+        frame_end = ends[0]
+        for i in range(1, n):
+            if (chrom_codes[i] != chrom_codes[i-1]) or (starts[i] >= frame_end):
+                selected[n_selected] = best
+                n_selected += 1
+                best = i
+                frame_end = ends[i]
+            else:
+                if ends[i] > frame_end: frame_end = ends[i]
+                if scores[i] > scores[best]: best = i
+        selected[n_selected] = best
+        n_selected += 1
+        return selected[:n_selected]
+
+
+# function _select_fw_peaks_python() is the pure-python form of the selection
+# sweep, used when numpy is not installed. it walks the sorted peak list with
+# a forward index rather than popping from the front (pop(0) shifts every
+# remaining element, making the old sweep O(n^2)), and tracks the current
+# cluster's best-scoring peak inline as a running argmax — the overlapping
+# peaks are never collected into a frame list only to be rescanned by max()
+# at every cluster boundary.
+def _select_fw_peaks_python(normalized_peaks):
+    final_peaks = []
+    best_peak = normalized_peaks[0]
+    best_score = score_value(best_peak.norm_score)
+    focus_chrom = best_peak.chrom
+    frame_end = best_peak.chromEnd
+    for i in range(1, len(normalized_peaks)):
+        nxt = normalized_peaks[i]
+        if (nxt.chrom == focus_chrom) and (nxt.chromStart < frame_end):
+            if nxt.chromEnd > frame_end: frame_end = nxt.chromEnd
+            nxt_score = score_value(nxt.norm_score)
+            if nxt_score > best_score:
+                best_peak = nxt
+                best_score = nxt_score
+        else:
+            final_peaks.append(best_peak)
+            best_peak = nxt
+            best_score = score_value(nxt.norm_score)
+            focus_chrom = nxt.chrom
+            frame_end = nxt.chromEnd
+    final_peaks.append(best_peak)
+    return final_peaks
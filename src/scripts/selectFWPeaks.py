@@ -9,8 +9,37 @@
 from argparse import ArgumentParser
 from atactools import peaks
 from atactools.peaks import STRATEGIES
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from heapq import merge
+from os import cpu_count
 from pathlib import Path
 
+# Function definitions
+# ----------------------------------------------------------------------------
+# function load_normalized_peaks() resolves the peak class for a single input
+# file from its extension, reads the records, and returns the normalized,
+# sorted peak list. defined at module level so it can be dispatched to
+# worker processes when several input files are given
+def load_normalized_peaks(infile, norm_strategy):
+    # resolve the input file type and the class of the subsequent peak object
+    infile_path = Path(infile).resolve()
+    if infile_path.suffix == ".narrowPeak":
+        peaks_type = peaks.NarrowPeak
+        field_name = "log_qval"
+    elif infile_path.suffix == ".bed":
+        peaks_type = peaks.Bed6
+        field_name = "score"
+    else:
+        errmsg = f"Error. Cannot resolve file type for {infile_path.name} from extension"
+        raise ValueError(errmsg)
+
+    # read in peaks, then sort and normalize
+    print(f"Reading and normalizing peaks from {infile_path.name}..")
+    raw_peaks = peaks.read_peaks(infile_path, peaks_type)
+    return peaks.normalize_peaks(raw_peaks, field_name, norm_strategy)
+
+
 # Main Execution Block
 # ----------------------------------------------------------------------------
 def main():
@@ -33,79 +62,39 @@ def main():
             help="input peaks files to select (.bed or .narrowPeak)")  
     args = parser.parse_args()
     
-    # read in each input file, normalize according to the specified method and sort
+    # read in each input file, normalize according to the specified method and
+    # sort. independent files are loaded and normalized in worker processes
     # ------------------------------------------------------------------------
-    normalized_peaks = [] # list for final normalized peak set from all files
-    for infile in args.input_peaks:
-        # resolve the input file type and the class of the subsequent peak object
-        infile_path = Path(infile).resolve()
-        if infile_path.suffix == ".narrowPeak":
-            peaks_type = peaks.NarrowPeak
-            field_name = "log_qval"
-        elif infile_path.suffix == ".bed":
-            peaks_type = peaks.Bed6
-            field_name = "score"
-        else:
-            errmsg = f"Error. Cannot resolve file type for {infile_path.name} from extension"
-            raise ValueError(errmsg)
+    loader = partial(load_normalized_peaks, norm_strategy=args.norm_strategy)
+    if len(args.input_peaks) > 1:
+        n_workers = min(len(args.input_peaks), cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            per_file_peaks = list(executor.map(loader, args.input_peaks))
+    else:
+        per_file_peaks = [loader(infile) for infile in args.input_peaks]
 
-        # open file buffer, and read in peaks
-        raw_peaks = [] # list for unnormalized peaks as they're read
-        with open(infile_path, 'r') as input_obj:
-            print(f"Reading and normalizing peaks from {infile_path.name}..")
-            for fields in input_obj:
-                raw_peaks.append(peaks_type(*fields.strip().split()))
-            
-            # sort and normalize 
-            normd = peaks.normalize_peaks(raw_peaks, field_name, args.norm_strategy)
-            normalized_peaks.extend(normd)
-
-    # sort concatenated peak set
-    print("Sorting Concatenated Peak set..")
-    normalized_peaks.sort()
+    # merge the per-file peak sets, which are already positionally sorted,
+    # rather than concatenating and re-sorting the full set from scratch
+    print("Merging sorted peak sets..")
+    if len(per_file_peaks) > 1:
+        normalized_peaks = list(merge(*per_file_peaks))
+    else:
+        normalized_peaks = per_file_peaks[0]
 
     # write out the normalized scores for all peaks if indicated by the user
     if args.write_out_all:
         print(f"Writing out all records with normalized scores...")
-        with open(args.write_out_all, 'w') as fobj:
-            for peak in normalized_peaks:
-                fobj.write(
-                    f"{peak.chrom}\t{peak.chromStart}\t{peak.chromEnd}"
-                    f"\t{peak.name}\t{peak.norm_score}\t{peak.strand}\n"
-                )
+        peaks.write_peaks(args.write_out_all, normalized_peaks)
 
-    # Select peaks, rolling from right to left by normalized score
+    # Select peaks, taking the best normalized score from each overlap cluster
     # ------------------------------------------------------------------------
     norm_peaks_n = len(normalized_peaks)
-    focus_peak = normalized_peaks.pop(0)
-    overlap_frame = [focus_peak]
-    final_peaks = []
-    
-    # roll through and select peaks
-    while len(normalized_peaks) > 0:
-        if focus_peak.intersect(normalized_peaks[0]):
-            overlap_frame.append(normalized_peaks.pop(0))
-        else:
-            scores = [p.norm_score for p in overlap_frame]
-            max_idx = scores.index(max(scores))
-            final_peaks.append(overlap_frame[max_idx])
-            focus_peak = normalized_peaks.pop(0)
-            overlap_frame = [focus_peak]
-
-    # select final peaks 
-    scores = [p.norm_score for p in overlap_frame]
-    max_idx = scores.index(max(scores))
-    final_peaks.append(overlap_frame[max_idx])
+    final_peaks = peaks.select_fw_peaks(normalized_peaks)
 
     # report the number of selected peaks
     final_peaks_n = len(final_peaks)
     print(f"Raw peaks: {norm_peaks_n}, Selected peaks: {final_peaks_n}")
     
     # write final bed outputs
-    with open(args.output_bed, 'w') as fobj:
-        for peak in final_peaks:
-            fobj.write(
-                f"{peak.chrom}\t{peak.chromStart}\t{peak.chromEnd}"
-                f"\t{peak.name}\t{peak.norm_score}\t{peak.strand}\n"
-            )
+    peaks.write_peaks(args.output_bed, final_peaks)
 